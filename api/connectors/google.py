@@ -8,6 +8,7 @@ from typing import Optional
 
 import httpx
 
+from api.config import get_settings
 from api.connectors.base import (
     Calendar,
     CalendarConnector,
@@ -77,8 +78,6 @@ class GoogleCalendarConnector(CalendarConnector):
 
     async def refresh_token(self) -> dict:
         """Refresh OAuth tokens."""
-        from api.config import get_settings
-
         settings = get_settings()
 
         async with httpx.AsyncClient() as client:
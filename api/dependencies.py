@@ -5,7 +5,8 @@ FastAPI dependencies for dependency injection.
 from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+import httpx
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from sqlalchemy import select
@@ -90,8 +91,14 @@ async def get_current_user_optional(
         return None
 
 
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Get the shared outbound HTTP client created at startup."""
+    return request.app.state.http_client
+
+
 # Type aliases for common dependencies
 DatabaseSession = Annotated[AsyncSession, Depends(get_async_session)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
 OptionalUser = Annotated[Optional[User], Depends(get_current_user_optional)]
 AppSettings = Annotated[Settings, Depends(get_settings)]
+HttpClient = Annotated[httpx.AsyncClient, Depends(get_http_client)]
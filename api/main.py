@@ -5,11 +5,14 @@ FastAPI Application - Main entry point for the API.
 import logging
 from contextlib import asynccontextmanager
 
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from api.config import get_settings
 from api.routers import auth, calendars, integrations, webhooks
+from api.services.cache import close_redis
 from db.database import close_db, init_db
 
 # Configure logging
@@ -29,13 +32,20 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up...")
     await init_db()
     logger.info("Database initialized")
+    app.state.http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=httpx.Timeout(30.0, connect=5.0),
+    )
 
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    await app.state.http_client.aclose()
     await close_db()
     logger.info("Database connections closed")
+    await close_redis()
+    logger.info("Redis connections closed")
 
 
 # Create FastAPI application
@@ -44,6 +54,7 @@ app = FastAPI(
     description="AI-powered Telegram bot for calendar and notes management",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
 )
@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class UserResponse(BaseModel):
@@ -19,8 +19,7 @@ class UserResponse(BaseModel):
     timezone: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AuthResponse(BaseModel):
@@ -41,8 +40,7 @@ class IntegrationResponse(BaseModel):
     # Don't expose credentials!
     settings: dict = Field(default_factory=dict)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CalendarResponse(BaseModel):
@@ -56,8 +54,7 @@ class CalendarResponse(BaseModel):
     is_enabled: bool
     provider: str  # Added from integration
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", frozen=True)
 
 
 class EventResponse(BaseModel):
@@ -100,6 +97,8 @@ class ParsedContentResponse(BaseModel):
     # For unclear
     clarification_needed: Optional[str] = None
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
 
 class ConflictResponse(BaseModel):
     """Calendar conflict response."""
@@ -5,7 +5,7 @@ Authentication router - Telegram Login Widget verification.
 import hashlib
 import hmac
 import logging
-from datetime import datetime, timedelta
+import time
 
 from fastapi import APIRouter, HTTPException, status
 from jose import jwt
@@ -20,6 +20,9 @@ from db.models import User
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Max age of Telegram Login Widget auth data (seconds)
+AUTH_DATE_MAX_AGE = 60 * 60
+
 
 def verify_telegram_auth(data: dict, bot_token: str) -> bool:
     """
@@ -54,11 +57,11 @@ def verify_telegram_auth(data: dict, bot_token: str) -> bool:
 
 def create_access_token(user_id: str, settings) -> str:
     """Create JWT access token for user."""
-    expire = datetime.utcnow() + timedelta(minutes=settings.jwt_expire_minutes)
+    now = int(time.time())
     payload = {
         "sub": user_id,
-        "exp": expire,
-        "iat": datetime.utcnow(),
+        "exp": now + settings.jwt_expire_minutes * 60,
+        "iat": now,
     }
     return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
@@ -90,8 +93,7 @@ async def telegram_auth(
         )
 
     # Check auth_date is not too old (max 1 hour)
-    auth_time = datetime.fromtimestamp(auth_data.auth_date)
-    if datetime.utcnow() - auth_time > timedelta(hours=1):
+    if time.time() - auth_data.auth_date > AUTH_DATE_MAX_AGE:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication expired",
@@ -134,9 +136,6 @@ async def get_current_user_info(
     settings: AppSettings,
 ):
     """Get current user information."""
-    from api.dependencies import get_current_user
-    from fastapi import Depends
-
     # This endpoint requires authentication via dependency
     # The actual user fetching is done in the dependency
     pass
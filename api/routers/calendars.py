@@ -3,21 +3,69 @@ Calendars router - Calendar management and event operations.
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta, tzinfo
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from redis import RedisError
+from sqlalchemy import bindparam, lambda_stmt, select, update
 
 from api.dependencies import CurrentUser, DatabaseSession
 from api.models.requests import CalendarSettingsRequest, EventCreateRequest
 from api.models.responses import CalendarResponse, ConflictResponse, EventResponse, TimeSlotResponse
+from api.services.cache import CALENDARS_CACHE_TTL, calendars_cache_key, redis_client
 from db.models import Calendar, Integration
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Serializers for list responses, built once instead of per response
+_CALENDAR_LIST_ADAPTER = TypeAdapter(list[CalendarResponse])
+_SLOT_LIST_ADAPTER = TypeAdapter(list[TimeSlotResponse])
+
+# Mock free slots start at 10:00 on each weekday
+SLOT_START_TIME = time(10, 0)
+
+# Cached statements - built and compiled once, re-executed with bound params
+_CALENDARS_BY_USER = lambda_stmt(
+    lambda: select(Calendar, Integration)
+    .join(Integration, Calendar.integration_id == Integration.id)
+    .where(Integration.user_id == bindparam("user_id"))
+)
+
+_PRIMARY_CALENDAR_BY_USER = lambda_stmt(
+    lambda: select(Calendar, Integration)
+    .join(Integration, Calendar.integration_id == Integration.id)
+    .where(
+        Integration.user_id == bindparam("user_id"),
+        Calendar.is_primary == True,
+    )
+)
+
+_CALENDAR_BY_ID = lambda_stmt(
+    lambda: select(Calendar, Integration)
+    .join(Integration, Calendar.integration_id == Integration.id)
+    .where(
+        Calendar.id == bindparam("calendar_id"),
+        Integration.user_id == bindparam("user_id"),
+    )
+)
+
+_UNSET_OTHER_PRIMARY = lambda_stmt(
+    lambda: update(Calendar)
+    .where(
+        Calendar.integration_id == Integration.id,
+        Integration.user_id == bindparam("user_id"),
+        Calendar.is_primary == True,
+        Calendar.id != bindparam("calendar_id"),
+    )
+    .values(is_primary=False)
+    .execution_options(synchronize_session=False)
+)
+
 
 @router.get("/", response_model=list[CalendarResponse])
 async def list_calendars(
@@ -25,14 +73,20 @@ async def list_calendars(
     session: DatabaseSession,
 ):
     """List all calendars for the current user."""
-    result = await session.execute(
-        select(Calendar, Integration)
-        .join(Integration, Calendar.integration_id == Integration.id)
-        .where(Integration.user_id == current_user.id)
-    )
+    cache_key = calendars_cache_key(current_user.id)
+    try:
+        cached = await redis_client.get(cache_key)
+    except RedisError as e:
+        # The cache is an optimization - fall back to the database
+        logger.warning(f"Calendars cache read failed: {e}")
+        cached = None
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    result = await session.execute(_CALENDARS_BY_USER, {"user_id": current_user.id})
     calendars_with_integrations = result.all()
 
-    return [
+    calendars = [
         CalendarResponse(
             id=cal.id,
             external_id=cal.external_id,
@@ -45,6 +99,14 @@ async def list_calendars(
         for cal, integration in calendars_with_integrations
     ]
 
+    content = _CALENDAR_LIST_ADAPTER.dump_json(calendars)
+    try:
+        await redis_client.set(cache_key, content, ex=CALENDARS_CACHE_TTL)
+    except RedisError as e:
+        logger.warning(f"Calendars cache write failed: {e}")
+
+    return Response(content=content, media_type="application/json")
+
 
 @router.get("/primary", response_model=Optional[CalendarResponse])
 async def get_primary_calendar(
@@ -53,12 +115,7 @@ async def get_primary_calendar(
 ):
     """Get the user's primary calendar."""
     result = await session.execute(
-        select(Calendar, Integration)
-        .join(Integration, Calendar.integration_id == Integration.id)
-        .where(
-            Integration.user_id == current_user.id,
-            Calendar.is_primary == True,
-        )
+        _PRIMARY_CALENDAR_BY_USER, {"user_id": current_user.id}
     )
     row = result.first()
 
@@ -86,12 +143,7 @@ async def update_calendar_settings(
 ):
     """Update calendar settings (primary, enabled)."""
     result = await session.execute(
-        select(Calendar, Integration)
-        .join(Integration, Calendar.integration_id == Integration.id)
-        .where(
-            Calendar.id == calendar_id,
-            Integration.user_id == current_user.id,
-        )
+        _CALENDAR_BY_ID, {"calendar_id": calendar_id, "user_id": current_user.id}
     )
     row = result.first()
 
@@ -103,31 +155,24 @@ async def update_calendar_settings(
 
     calendar, integration = row
 
-    # If setting as primary, unset other primary calendars
+    # If setting as primary, unset other primary calendars in one statement
     if request.is_primary:
         await session.execute(
-            select(Calendar)
-            .join(Integration, Calendar.integration_id == Integration.id)
-            .where(
-                Integration.user_id == current_user.id,
-                Calendar.is_primary == True,
-            )
+            _UNSET_OTHER_PRIMARY,
+            {"calendar_id": calendar.id, "user_id": current_user.id},
         )
-        # Unset all primary calendars for this user
-        all_cals_result = await session.execute(
-            select(Calendar)
-            .join(Integration, Calendar.integration_id == Integration.id)
-            .where(Integration.user_id == current_user.id)
-        )
-        for cal in all_cals_result.scalars():
-            cal.is_primary = False
 
     if request.is_primary is not None:
         calendar.is_primary = request.is_primary
     if request.is_enabled is not None:
         calendar.is_enabled = request.is_enabled
 
-    await session.flush()
+    # Commit before invalidating, so a concurrent read can't re-cache the old rows
+    await session.commit()
+    try:
+        await redis_client.delete(calendars_cache_key(current_user.id))
+    except RedisError as e:
+        logger.warning(f"Calendars cache invalidation failed: {e}")
 
     return CalendarResponse(
         id=calendar.id,
@@ -196,18 +241,40 @@ async def get_free_slots(
     # TODO: Implement actual free slot calculation
     logger.info(f"Finding free slots for user {current_user.id}")
 
-    # Return mock slots
+    # Last day whose slot still starts before `end`
+    if start.tzinfo is not None and end.tzinfo is not None:
+        end = end.astimezone(start.tzinfo)
+    last_day = end.date()
+    if datetime.combine(last_day, SLOT_START_TIME, tzinfo=start.tzinfo) >= end:
+        last_day -= timedelta(days=1)
+
+    return Response(
+        content=_compute_free_slots(start.date(), last_day, start.tzinfo, duration_minutes),
+        media_type="application/json",
+    )
+
+
+@lru_cache(maxsize=1024)
+def _compute_free_slots(
+    start_day: date,
+    last_day: date,
+    tz: Optional[tzinfo],
+    duration_minutes: int,
+) -> bytes:
+    """Build the serialized mock slot list; pure, so results are memoized."""
     slots = []
-    current = start.replace(hour=10, minute=0, second=0, microsecond=0)
+    current = datetime.combine(start_day, SLOT_START_TIME, tzinfo=tz)
 
-    while current < end:
+    while current.date() <= last_day:
         if current.weekday() < 5:  # Weekdays only
             slot_end = current + timedelta(minutes=duration_minutes)
             if slot_end.hour <= 18:  # Working hours
                 slots.append(TimeSlotResponse(start=current, end=slot_end))
+                if len(slots) == 5:  # Return max 5 slots
+                    break
         current += timedelta(days=1)
 
-    return slots[:5]  # Return max 5 slots
+    return _SLOT_LIST_ADAPTER.dump_json(slots)
 
 
 @router.post("/check-conflicts", response_model=ConflictResponse)
@@ -2,104 +2,140 @@
 Integrations router - OAuth flows and integration management.
 """
 
+import asyncio
 import logging
-import secrets
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from functools import cache
+from types import MappingProxyType
 from typing import Optional
 from urllib.parse import urlencode
 
+import caldav
 from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
+from redis import RedisError
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
 
-from api.config import get_settings
-from api.dependencies import AppSettings, CurrentUser, DatabaseSession
+from api.config import Settings, get_settings
+from api.dependencies import AppSettings, CurrentUser, DatabaseSession, HttpClient
 from api.models.requests import AppleCalendarConnectRequest, IntegrationConnectRequest
 from api.models.responses import IntegrationResponse, IntegrationStatusResponse, OAuthURLResponse
+from api.services.cache import calendars_cache_key, redis_client
 from api.utils.crypto import encrypt_credentials
+from api.utils.oauth_state import consume_oauth_state, create_oauth_state
 from db.models import Integration
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# OAuth state storage (in production, use Redis)
-_oauth_states: dict[str, str] = {}
+# Bound once - called on every callback and /status response
+_validate_integration = IntegrationResponse.model_validate
 
 
 # ============= OAuth URL Generation =============
 
-
-@router.get("/google/auth", response_model=OAuthURLResponse)
-async def get_google_auth_url(settings: AppSettings):
-    """Get Google OAuth authorization URL."""
-    if not settings.google_client_id:
+@dataclass(frozen=True, slots=True)
+class OAuthProviderConfig:
+    """Static OAuth authorization-URL settings for one provider."""
+
+    display_name: str
+    auth_url: str
+    client_id_attr: str  # Settings attribute with the client ID
+    redirect_uri_attr: str  # Settings attribute with the redirect URI
+    extra_params: dict[str, str]
+
+
+_OAUTH_PROVIDERS: dict[str, OAuthProviderConfig] = {
+    "google": OAuthProviderConfig(
+        display_name="Google",
+        auth_url="https://accounts.google.com/o/oauth2/v2/auth",
+        client_id_attr="google_client_id",
+        redirect_uri_attr="google_redirect_uri",
+        extra_params={
+            "response_type": "code",
+            "scope": "https://www.googleapis.com/auth/calendar.events https://www.googleapis.com/auth/calendar.readonly",
+            "access_type": "offline",
+            "prompt": "consent",
+        },
+    ),
+    "outlook": OAuthProviderConfig(
+        display_name="Microsoft",
+        auth_url="https://login.microsoftonline.com/common/oauth2/v2.0/authorize",
+        client_id_attr="microsoft_client_id",
+        redirect_uri_attr="microsoft_redirect_uri",
+        extra_params={
+            "response_type": "code",
+            "response_mode": "query",
+            "scope": "offline_access Calendars.ReadWrite User.Read",
+        },
+    ),
+    "notion": OAuthProviderConfig(
+        display_name="Notion",
+        auth_url="https://api.notion.com/v1/oauth/authorize",
+        client_id_attr="notion_client_id",
+        redirect_uri_attr="notion_redirect_uri",
+        extra_params={
+            "response_type": "code",
+            "owner": "user",
+        },
+    ),
+}
+
+
+def _build_oauth_url(provider: str, settings: Settings) -> OAuthURLResponse:
+    """Build the OAuth authorization URL for a provider with a signed state."""
+    config = _OAUTH_PROVIDERS[provider]
+    client_id = getattr(settings, config.client_id_attr)
+    if not client_id:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Google OAuth not configured",
+            detail=f"{config.display_name} OAuth not configured",
         )
 
-    state = secrets.token_urlsafe(32)
-    _oauth_states[state] = "google"
+    state = create_oauth_state(provider)
 
-    params = {
-        "client_id": settings.google_client_id,
-        "redirect_uri": settings.google_redirect_uri,
-        "response_type": "code",
-        "scope": "https://www.googleapis.com/auth/calendar.events https://www.googleapis.com/auth/calendar.readonly",
-        "access_type": "offline",
-        "prompt": "consent",
-        "state": state,
-    }
-    url = f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(params)}"
+    # The state is URL-safe base64 and dots, so it can be appended as-is
+    prefix = _oauth_url_prefix(
+        provider, client_id, getattr(settings, config.redirect_uri_attr)
+    )
+    url = f"{prefix}&state={state}"
 
     return OAuthURLResponse(authorization_url=url, state=state)
 
 
-@router.get("/outlook/auth", response_model=OAuthURLResponse)
-async def get_outlook_auth_url(settings: AppSettings):
-    """Get Microsoft OAuth authorization URL."""
-    if not settings.microsoft_client_id:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Microsoft OAuth not configured",
-        )
-
-    state = secrets.token_urlsafe(32)
-    _oauth_states[state] = "outlook"
-
+@cache
+def _oauth_url_prefix(provider: str, client_id: str, redirect_uri: str) -> str:
+    """Authorization URL with all static query params; only `state` is appended."""
+    config = _OAUTH_PROVIDERS[provider]
     params = {
-        "client_id": settings.microsoft_client_id,
-        "response_type": "code",
-        "redirect_uri": settings.microsoft_redirect_uri,
-        "response_mode": "query",
-        "scope": "offline_access Calendars.ReadWrite User.Read",
-        "state": state,
+        "client_id": client_id,
+        "redirect_uri": redirect_uri,
+        **config.extra_params,
     }
-    url = f"https://login.microsoftonline.com/common/oauth2/v2.0/authorize?{urlencode(params)}"
+    return f"{config.auth_url}?{urlencode(params)}"
 
-    return OAuthURLResponse(authorization_url=url, state=state)
 
+def _make_auth_url_endpoint(provider: str) -> Callable[..., Awaitable[OAuthURLResponse]]:
+    """Create the GET /{provider}/auth endpoint for a provider."""
 
-@router.get("/notion/auth", response_model=OAuthURLResponse)
-async def get_notion_auth_url(settings: AppSettings):
-    """Get Notion OAuth authorization URL."""
-    if not settings.notion_client_id:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Notion OAuth not configured",
-        )
+    async def get_auth_url(settings: AppSettings) -> OAuthURLResponse:
+        return _build_oauth_url(provider, settings)
 
-    state = secrets.token_urlsafe(32)
-    _oauth_states[state] = "notion"
+    get_auth_url.__doc__ = (
+        f"Get {_OAUTH_PROVIDERS[provider].display_name} OAuth authorization URL."
+    )
+    return get_auth_url
 
-    params = {
-        "client_id": settings.notion_client_id,
-        "response_type": "code",
-        "owner": "user",
-        "redirect_uri": settings.notion_redirect_uri,
-        "state": state,
-    }
-    url = f"https://api.notion.com/v1/oauth/authorize?{urlencode(params)}"
 
-    return OAuthURLResponse(authorization_url=url, state=state)
+for _provider in _OAUTH_PROVIDERS:
+    router.add_api_route(
+        f"/{_provider}/auth",
+        _make_auth_url_endpoint(_provider),
+        methods=["GET"],
+        response_model=OAuthURLResponse,
+        name=f"get_{_provider}_auth_url",
+    )
 
 
 # ============= OAuth Callbacks =============
@@ -111,38 +147,36 @@ async def google_oauth_callback(
     current_user: CurrentUser,
     session: DatabaseSession,
     settings: AppSettings,
+    http_client: HttpClient,
 ):
     """Handle Google OAuth callback and store tokens."""
-    import httpx
-
     # Verify state
-    if request.state and _oauth_states.get(request.state) != "google":
+    if request.state and await consume_oauth_state(request.state) != "google":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid OAuth state",
         )
 
     # Exchange code for tokens
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "client_id": settings.google_client_id,
-                "client_secret": settings.google_client_secret,
-                "code": request.code,
-                "grant_type": "authorization_code",
-                "redirect_uri": settings.google_redirect_uri,
-            },
-        )
+    response = await http_client.post(
+        "https://oauth2.googleapis.com/token",
+        data={
+            "client_id": settings.google_client_id,
+            "client_secret": settings.google_client_secret,
+            "code": request.code,
+            "grant_type": "authorization_code",
+            "redirect_uri": settings.google_redirect_uri,
+        },
+    )
 
-        if response.status_code != 200:
-            logger.error(f"Google token exchange failed: {response.text}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to exchange authorization code",
-            )
+    if response.status_code != 200:
+        logger.error(f"Google token exchange failed: {response.text}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to exchange authorization code",
+        )
 
-        tokens = response.json()
+    tokens = response.json()
 
     # Store integration
     integration = await _create_or_update_integration(
@@ -152,11 +186,7 @@ async def google_oauth_callback(
         credentials=tokens,
     )
 
-    # Clean up state
-    if request.state:
-        _oauth_states.pop(request.state, None)
-
-    return IntegrationResponse.model_validate(integration)
+    return _validate_integration(integration)
 
 
 @router.post("/outlook/callback", response_model=IntegrationResponse)
@@ -165,39 +195,37 @@ async def outlook_oauth_callback(
     current_user: CurrentUser,
     session: DatabaseSession,
     settings: AppSettings,
+    http_client: HttpClient,
 ):
     """Handle Microsoft OAuth callback and store tokens."""
-    import httpx
-
     # Verify state
-    if request.state and _oauth_states.get(request.state) != "outlook":
+    if request.state and await consume_oauth_state(request.state) != "outlook":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid OAuth state",
         )
 
     # Exchange code for tokens
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://login.microsoftonline.com/common/oauth2/v2.0/token",
-            data={
-                "client_id": settings.microsoft_client_id,
-                "client_secret": settings.microsoft_client_secret,
-                "code": request.code,
-                "grant_type": "authorization_code",
-                "redirect_uri": settings.microsoft_redirect_uri,
-                "scope": "offline_access Calendars.ReadWrite User.Read",
-            },
-        )
+    response = await http_client.post(
+        "https://login.microsoftonline.com/common/oauth2/v2.0/token",
+        data={
+            "client_id": settings.microsoft_client_id,
+            "client_secret": settings.microsoft_client_secret,
+            "code": request.code,
+            "grant_type": "authorization_code",
+            "redirect_uri": settings.microsoft_redirect_uri,
+            "scope": "offline_access Calendars.ReadWrite User.Read",
+        },
+    )
 
-        if response.status_code != 200:
-            logger.error(f"Microsoft token exchange failed: {response.text}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to exchange authorization code",
-            )
+    if response.status_code != 200:
+        logger.error(f"Microsoft token exchange failed: {response.text}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to exchange authorization code",
+        )
 
-        tokens = response.json()
+    tokens = response.json()
 
     # Store integration
     integration = await _create_or_update_integration(
@@ -207,10 +235,7 @@ async def outlook_oauth_callback(
         credentials=tokens,
     )
 
-    if request.state:
-        _oauth_states.pop(request.state, None)
-
-    return IntegrationResponse.model_validate(integration)
+    return _validate_integration(integration)
 
 
 @router.post("/notion/callback", response_model=IntegrationResponse)
@@ -219,46 +244,38 @@ async def notion_oauth_callback(
     current_user: CurrentUser,
     session: DatabaseSession,
     settings: AppSettings,
+    http_client: HttpClient,
 ):
     """Handle Notion OAuth callback and store tokens."""
-    import base64
-
-    import httpx
-
     # Verify state
-    if request.state and _oauth_states.get(request.state) != "notion":
+    if request.state and await consume_oauth_state(request.state) != "notion":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid OAuth state",
         )
 
-    # Notion uses Basic auth for token exchange
-    credentials = base64.b64encode(
-        f"{settings.notion_client_id}:{settings.notion_client_secret}".encode()
-    ).decode()
-
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://api.notion.com/v1/oauth/token",
-            headers={
-                "Authorization": f"Basic {credentials}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "grant_type": "authorization_code",
-                "code": request.code,
-                "redirect_uri": settings.notion_redirect_uri,
-            },
-        )
+    response = await http_client.post(
+        "https://api.notion.com/v1/oauth/token",
+        headers={
+            # Notion uses Basic auth for token exchange
+            "Authorization": settings.notion_basic_auth_header,
+            "Content-Type": "application/json",
+        },
+        json={
+            "grant_type": "authorization_code",
+            "code": request.code,
+            "redirect_uri": settings.notion_redirect_uri,
+        },
+    )
 
-        if response.status_code != 200:
-            logger.error(f"Notion token exchange failed: {response.text}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to exchange authorization code",
-            )
+    if response.status_code != 200:
+        logger.error(f"Notion token exchange failed: {response.text}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to exchange authorization code",
+        )
 
-        tokens = response.json()
+    tokens = response.json()
 
     # Store integration
     integration = await _create_or_update_integration(
@@ -268,10 +285,7 @@ async def notion_oauth_callback(
         credentials=tokens,
     )
 
-    if request.state:
-        _oauth_states.pop(request.state, None)
-
-    return IntegrationResponse.model_validate(integration)
+    return _validate_integration(integration)
 
 
 @router.post("/apple-calendar", response_model=IntegrationResponse)
@@ -281,18 +295,15 @@ async def connect_apple_calendar(
     session: DatabaseSession,
 ):
     """Connect Apple Calendar via CalDAV with app-specific password."""
-    import caldav
-
     # Test CalDAV connection
     try:
-        client = caldav.DAVClient(
-            url="https://caldav.icloud.com",
-            username=request.email,
-            password=request.app_password,
+        calendars_count = await asyncio.to_thread(
+            _probe_caldav,
+            "https://caldav.icloud.com",
+            request.email,
+            request.app_password,
         )
-        principal = client.principal()
-        calendars = principal.calendars()
-        logger.info(f"Connected to Apple Calendar: {len(calendars)} calendars found")
+        logger.info(f"Connected to Apple Calendar: {calendars_count} calendars found")
     except Exception as e:
         logger.error(f"Apple Calendar connection failed: {e}")
         raise HTTPException(
@@ -313,11 +324,19 @@ async def connect_apple_calendar(
         credentials=credentials,
     )
 
-    return IntegrationResponse.model_validate(integration)
+    return _validate_integration(integration)
 
 
 # ============= Integration Management =============
 
+# Integration provider -> IntegrationStatusResponse field
+_PROVIDER_STATUS_FIELDS: Mapping[str, str] = MappingProxyType({
+    "google_calendar": "google_calendar",
+    "outlook": "outlook",
+    "apple_calendar": "apple_calendar",
+    "notion": "notion",
+})
+
 
 @router.get("/status", response_model=IntegrationStatusResponse)
 async def get_integration_status(
@@ -325,24 +344,32 @@ async def get_integration_status(
     session: DatabaseSession,
 ):
     """Get status of all integrations for current user."""
-    result = await session.execute(
-        select(Integration).where(Integration.user_id == current_user.id)
+    # One row: {provider: {...}} with only the columns IntegrationResponse needs
+    by_provider = await session.scalar(
+        select(
+            func.jsonb_object_agg(
+                Integration.provider,
+                func.jsonb_build_object(
+                    "id", Integration.id,
+                    "provider", Integration.provider,
+                    "is_active", Integration.is_active,
+                    "created_at", Integration.created_at,
+                    "settings", Integration.settings,
+                ),
+            )
+        ).where(
+            Integration.user_id == current_user.id,
+            Integration.is_active.is_(True),
+            Integration.provider.in_(_PROVIDER_STATUS_FIELDS.keys()),
+        )
     )
-    integrations = result.scalars().all()
-
-    status = IntegrationStatusResponse()
-    for integration in integrations:
-        response = IntegrationResponse.model_validate(integration)
-        if integration.provider == "google_calendar":
-            status.google_calendar = response
-        elif integration.provider == "outlook":
-            status.outlook = response
-        elif integration.provider == "apple_calendar":
-            status.apple_calendar = response
-        elif integration.provider == "notion":
-            status.notion = response
 
-    return status
+    return IntegrationStatusResponse(
+        **{
+            _PROVIDER_STATUS_FIELDS[provider]: _validate_integration(data)
+            for provider, data in (by_provider or {}).items()
+        }
+    )
 
 
 @router.delete("/{provider}")
@@ -352,57 +379,72 @@ async def disconnect_integration(
     session: DatabaseSession,
 ):
     """Disconnect an integration."""
-    result = await session.execute(
-        select(Integration).where(
+    deleted_id = await session.scalar(
+        delete(Integration)
+        .where(
             Integration.user_id == current_user.id,
             Integration.provider == provider,
         )
+        .returning(Integration.id)
     )
-    integration = result.scalar_one_or_none()
 
-    if not integration:
+    if deleted_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Integration not found",
         )
 
-    await session.delete(integration)
+    # Calendars of this integration are removed by the FK ON DELETE CASCADE.
+    # Commit before invalidating, so a concurrent read can't re-cache the old rows
+    await session.commit()
+    try:
+        await redis_client.delete(calendars_cache_key(current_user.id))
+    except RedisError as e:
+        logger.warning(f"Calendars cache invalidation failed: {e}")
     return {"status": "disconnected", "provider": provider}
 
 
 # ============= Helper Functions =============
 
 
+def _probe_caldav(url: str, username: str, password: str) -> int:
+    """
+    Log in to a CalDAV server and count the user's calendars.
+
+    Blocking (caldav is synchronous) - run it in a worker thread.
+    """
+    client = caldav.DAVClient(url=url, username=username, password=password)
+    return len(client.principal().calendars())
+
+
 async def _create_or_update_integration(
     session,
     user_id,
     provider: str,
     credentials: dict,
 ) -> Integration:
-    """Create or update an integration."""
-    result = await session.execute(
-        select(Integration).where(
-            Integration.user_id == user_id,
-            Integration.provider == provider,
-        )
-    )
-    integration = result.scalar_one_or_none()
+    """Create or update an integration in a single INSERT ... ON CONFLICT."""
+    stored_credentials = {"encrypted": encrypt_credentials(credentials)}
 
-    encrypted_credentials = encrypt_credentials(credentials)
-
-    if integration:
-        integration.credentials = {"encrypted": encrypted_credentials}
-        integration.is_active = True
-        logger.info(f"Updated integration: {provider}")
-    else:
-        integration = Integration(
+    stmt = (
+        insert(Integration)
+        .values(
             user_id=user_id,
             provider=provider,
-            credentials={"encrypted": encrypted_credentials},
+            credentials=stored_credentials,
             is_active=True,
         )
-        session.add(integration)
-        logger.info(f"Created integration: {provider}")
+        .on_conflict_do_update(
+            constraint="uq_user_provider",
+            set_={
+                "credentials": stored_credentials,
+                "is_active": True,
+            },
+        )
+        .returning(Integration)
+        .execution_options(populate_existing=True)
+    )
+    integration = (await session.execute(stmt)).scalar_one()
 
-    await session.flush()
+    logger.info(f"Saved integration: {provider}")
     return integration
@@ -2,9 +2,12 @@
 Webhooks router - Telegram webhook handling.
 """
 
+import hmac
 import logging
+import tempfile
 
-from fastapi import APIRouter, HTTPException, Request, status
+import orjson
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, status
 
 from api.config import get_settings
 from api.dependencies import DatabaseSession
@@ -17,11 +20,18 @@ router = APIRouter()
 
 settings = get_settings()
 
+# Telegram updates are small JSON documents
+WEBHOOK_MAX_BODY_SIZE = 1 << 20  # 1 MB
+
+# Uploaded audio is kept in memory up to this size, then spooled to disk
+AUDIO_SPOOL_MAX_MEMORY = 1 << 20  # 1 MB
+
 
 @router.post("/webhook")
 async def telegram_webhook(
     request: Request,
     session: DatabaseSession,
+    background_tasks: BackgroundTasks,
 ):
     """
     Handle incoming Telegram webhook updates.
@@ -31,32 +41,64 @@ async def telegram_webhook(
     """
     # Verify webhook secret if configured
     if settings.telegram_webhook_secret:
-        secret_header = request.headers.get("X-Telegram-Bot-Api-Secret-Token")
-        if secret_header != settings.telegram_webhook_secret:
+        secret_header = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if not hmac.compare_digest(
+            secret_header.encode(), settings.telegram_webhook_secret.encode()
+        ):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid webhook secret",
             )
 
+    # Reject oversized updates before reading the body
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > WEBHOOK_MAX_BODY_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Update too large",
+        )
+
+    # Enforce the limit while reading too - Content-Length may be absent or lie
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > WEBHOOK_MAX_BODY_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Update too large",
+            )
+
     # Parse update
     try:
-        update = await request.json()
-    except Exception as e:
+        update = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse webhook update: {e}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid JSON",
         )
+    if not isinstance(update, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Update must be a JSON object",
+        )
 
-    logger.info(f"Received webhook update: {update.get('update_id')}")
-
-    # Process update
-    # Note: In the actual implementation, the bot service handles this
-    # This endpoint just receives the webhook and can forward to internal processing
+    # Acknowledge immediately so Telegram doesn't time out and resend the update
+    background_tasks.add_task(process_update, update)
 
     return {"ok": True}
 
 
+async def process_update(update: dict) -> None:
+    """
+    Process a Telegram update after the webhook has been acknowledged.
+
+    Note: In the actual implementation, the bot service handles this.
+    This is the hook for forwarding updates to internal processing.
+    """
+    logger.info(f"Received webhook update: {update.get('update_id')}")
+
+
 @router.post("/parse", response_model=ParsedContentResponse)
 async def parse_user_message(
     request: ParseRequest,
@@ -94,16 +136,21 @@ async def transcribe_voice_message(
             detail="Expected audio content",
         )
 
-    audio_bytes = await request.body()
-    if len(audio_bytes) == 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Empty audio file",
-        )
+    # Spool the body instead of buffering it whole; spills to disk past 1 MB
+    with tempfile.SpooledTemporaryFile(max_size=AUDIO_SPOOL_MAX_MEMORY) as audio:
+        async for chunk in request.stream():
+            audio.write(chunk)
+
+        if audio.tell() == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Empty audio file",
+            )
+        audio.seek(0)
 
-    # Get filename from header if provided
-    filename = request.headers.get("X-Filename", "audio.oga")
+        # Get filename from header if provided
+        filename = request.headers.get("X-Filename", "audio.oga")
 
-    text = await transcribe_voice(audio_bytes, filename)
+        text = await transcribe_voice(audio, filename)
 
     return {"text": text}
@@ -0,0 +1,59 @@
+"""
+Redis client shared by API routers and services.
+"""
+
+import hashlib
+from typing import Optional
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from api.config import get_settings
+
+settings = get_settings()
+
+# Shared connection pool: callers wait for a free connection instead of
+# opening unbounded sockets, and idle sockets are health-checked before reuse
+REDIS_MAX_CONNECTIONS = 50
+REDIS_POOL_TIMEOUT = 20  # seconds to wait for a free connection
+REDIS_HEALTH_CHECK_INTERVAL = 30  # seconds
+
+# Create Redis client (connects lazily on first command; owns the pool)
+redis_client: redis.Redis = redis.Redis.from_pool(
+    redis.BlockingConnectionPool.from_url(
+        settings.redis_url,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+    )
+)
+
+# Calendar list cache
+CALENDARS_CACHE_TTL = 60  # seconds
+
+# Parsed message results (keys include the minute, so they expire with it)
+PARSE_CACHE_TTL = 60  # seconds
+
+
+def calendars_cache_key(user_id: UUID) -> str:
+    """Redis key for a user's serialized calendar list."""
+    return f"cals:{user_id}"
+
+
+def parse_cache_key(
+    text: str,
+    user_timezone: str,
+    forwarded_from: Optional[str],
+    minute: str,
+) -> str:
+    """Redis key for a parsed message; relative dates depend on the minute."""
+    # Hash the free text to keep keys short (messages can be kilobytes)
+    digest = hashlib.blake2b(
+        f"{forwarded_from or ''}\0{text}".encode(), digest_size=16
+    ).hexdigest()
+    return f"parse:{user_timezone}:{minute}:{digest}"
+
+
+async def close_redis() -> None:
+    """Close Redis connections and the pool."""
+    await redis_client.aclose()
@@ -2,22 +2,40 @@
 Parser service - Whisper transcription and GPT parsing.
 """
 
-import json
 import logging
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import BinaryIO, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+import orjson
 from openai import AsyncOpenAI
+from redis import RedisError
 
 from api.config import get_settings
 from api.models.responses import ParsedContentResponse
+from api.services.cache import PARSE_CACHE_TTL, parse_cache_key, redis_client
 
 logger = logging.getLogger(__name__)
 
-settings = get_settings()
+DEFAULT_TIMEZONE = "Europe/Moscow"
+
+
+@lru_cache
+def _get_client() -> AsyncOpenAI:
+    """Get the OpenAI client, created on first use rather than at import."""
+    return AsyncOpenAI(api_key=get_settings().openai_api_key)
+
+
+@lru_cache(maxsize=64)
+def _tz(name: str) -> ZoneInfo:
+    """Get a timezone by name, falling back to the default for unknown names."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown timezone {name!r}, using {DEFAULT_TIMEZONE}")
+        return ZoneInfo(DEFAULT_TIMEZONE)
 
-# Initialize OpenAI client
-client = AsyncOpenAI(api_key=settings.openai_api_key)
 
 # GPT prompt for parsing messages
 PARSE_PROMPT_TEMPLATE = """You are a message parser for a calendar assistant. Extract event or note information from user messages.
@@ -53,13 +71,28 @@ Rules:
 - Keywords with date/time + action/person → content_type = "event"
 - Return ONLY JSON, no markdown, no explanation"""
 
+# Static text before the datetime, and the template for everything after it
+_PROMPT_HEAD, _PROMPT_TAIL_TEMPLATE = PARSE_PROMPT_TEMPLATE.split("{current_datetime}")
+
 
-async def transcribe_voice(audio_bytes: bytes, filename: str = "audio.oga") -> str:
+@lru_cache(maxsize=64)
+def _prompt_tail(user_timezone: str, forwarded_from: Optional[str]) -> str:
+    """Format the part of the prompt that follows the current datetime."""
+    forwarded_context = (
+        f"Message forwarded from: {forwarded_from}" if forwarded_from else ""
+    )
+    return _PROMPT_TAIL_TEMPLATE.format(
+        user_timezone=user_timezone,
+        forwarded_context=forwarded_context,
+    )
+
+
+async def transcribe_voice(audio: BinaryIO, filename: str = "audio.oga") -> str:
     """
     Transcribe voice message using OpenAI Whisper API.
 
     Args:
-        audio_bytes: Raw audio bytes (Telegram sends .oga format).
+        audio: Binary file object with the audio (Telegram sends .oga format).
         filename: Original filename with extension.
 
     Returns:
@@ -68,13 +101,13 @@ async def transcribe_voice(audio_bytes: bytes, filename: str = "audio.oga") -> s
     Raises:
         Exception: If transcription fails.
     """
-    logger.info(f"Transcribing audio: {len(audio_bytes)} bytes")
+    logger.info(f"Transcribing audio: {filename}")
 
     try:
-        # Create a file-like object for the API
-        transcription = await client.audio.transcriptions.create(
-            model=settings.openai_whisper_model,
-            file=(filename, audio_bytes),
+        # The API reads the audio straight from the file object
+        transcription = await _get_client().audio.transcriptions.create(
+            model=get_settings().openai_whisper_model,
+            file=(filename, audio),
             response_format="text",
         )
 
@@ -107,43 +140,42 @@ async def parse_message(
     """
     logger.info(f"Parsing message: {text[:100]}...")
 
-    # Build the prompt
-    current_datetime = datetime.now().isoformat()
-    forwarded_context = (
-        f"Message forwarded from: {forwarded_from}" if forwarded_from else ""
-    )
+    now = datetime.now(_tz(user_timezone))
 
-    prompt = PARSE_PROMPT_TEMPLATE.format(
-        current_datetime=current_datetime,
-        user_timezone=user_timezone,
-        forwarded_context=forwarded_context,
+    # Same message in the same minute parses the same way - reuse the result
+    cache_key = parse_cache_key(
+        text, user_timezone, forwarded_from, now.strftime("%Y%m%d%H%M")
     )
+    try:
+        cached = await redis_client.get(cache_key)
+    except RedisError as e:
+        # The cache is an optimization - fail open and ask GPT
+        logger.warning(f"Parse cache read failed: {e}")
+        cached = None
+    if cached is not None:
+        logger.info("Parse cache hit")
+        return ParsedContentResponse.model_validate_json(cached)
+
+    # Build the prompt - only the datetime changes on every call
+    prompt = f"{_PROMPT_HEAD}{now.isoformat()}{_prompt_tail(user_timezone, forwarded_from)}"
 
     try:
-        response = await client.chat.completions.create(
-            model=settings.openai_model,
+        response = await _get_client().chat.completions.create(
+            model=get_settings().openai_model,
             messages=[
                 {"role": "system", "content": prompt},
                 {"role": "user", "content": text},
             ],
             temperature=0.1,  # Low temperature for consistent parsing
             max_tokens=1000,
+            response_format={"type": "json_object"},  # Bare JSON, no markdown fences
         )
 
-        result_text = response.choices[0].message.content.strip()
-
-        # Clean up potential markdown formatting
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-            result_text = result_text.strip()
-
         # Parse JSON response
-        parsed_data = json.loads(result_text)
+        parsed_data = orjson.loads(response.choices[0].message.content)
 
         # Convert to response model
-        return ParsedContentResponse(
+        result = ParsedContentResponse(
             content_type=parsed_data.get("content_type", "unclear"),
             confidence=float(parsed_data.get("confidence", 0.5)),
             title=parsed_data.get("title"),
@@ -156,8 +188,13 @@ async def parse_message(
             note_content=parsed_data.get("note_content"),
             clarification_needed=parsed_data.get("clarification_needed"),
         )
+        try:
+            await redis_client.set(cache_key, result.model_dump_json(), ex=PARSE_CACHE_TTL)
+        except RedisError as e:
+            logger.warning(f"Parse cache write failed: {e}")
+        return result
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse GPT response as JSON: {e}")
         return ParsedContentResponse(
             content_type="unclear",
@@ -2,9 +2,11 @@
 Cryptography utilities for encrypting/decrypting credentials.
 """
 
-import json
 import logging
+from functools import lru_cache
+from typing import Union
 
+import orjson
 from cryptography.fernet import Fernet, InvalidToken
 
 from api.config import get_settings
@@ -12,8 +14,9 @@ from api.config import get_settings
 logger = logging.getLogger(__name__)
 
 
+@lru_cache
 def get_fernet() -> Fernet:
-    """Get Fernet instance with encryption key from settings."""
+    """Get cached Fernet instance with encryption key from settings."""
     settings = get_settings()
     if not settings.encryption_key:
         raise ValueError("ENCRYPTION_KEY is not set")
@@ -30,18 +33,16 @@ def encrypt_credentials(credentials: dict) -> str:
     Returns:
         Base64-encoded encrypted string.
     """
-    f = get_fernet()
-    json_bytes = json.dumps(credentials).encode("utf-8")
-    encrypted = f.encrypt(json_bytes)
-    return encrypted.decode("utf-8")
+    # Fernet tokens are ASCII; the str form goes into the JSONB column
+    return get_fernet().encrypt(orjson.dumps(credentials)).decode("ascii")
 
 
-def decrypt_credentials(encrypted: str) -> dict:
+def decrypt_credentials(encrypted: Union[str, bytes]) -> dict:
     """
     Decrypt credentials from database.
 
     Args:
-        encrypted: Base64-encoded encrypted string.
+        encrypted: Base64-encoded encrypted token (str or bytes).
 
     Returns:
         Decrypted credentials dictionary.
@@ -51,8 +52,8 @@ def decrypt_credentials(encrypted: str) -> dict:
     """
     try:
         f = get_fernet()
-        decrypted = f.decrypt(encrypted.encode("utf-8"))
-        return json.loads(decrypted.decode("utf-8"))
+        # Fernet accepts the token as str directly
+        return orjson.loads(f.decrypt(encrypted))
     except InvalidToken:
         logger.error("Failed to decrypt credentials - invalid token")
         raise
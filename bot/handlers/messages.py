@@ -2,42 +2,88 @@
 Message handlers for text, voice, and forwarded messages.
 """
 
+import asyncio
 import logging
+from datetime import datetime
 from typing import Optional
 
 import httpx
+import orjson
 from aiogram import F, Router
+from aiogram.filters.callback_data import CallbackData
 from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from bot.config import config
+from bot.storage import delete_pending, pop_pending, save_pending
 
 logger = logging.getLogger(__name__)
 router = Router()
 
-# Temporary storage for pending events (in production, use Redis)
-pending_events: dict[str, dict] = {}
+# Shared client for backend API calls (keeps connections to the API alive)
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared API client, created on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            base_url=config.API_URL,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=60.0,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared API client."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class EventCallback(CallbackData, prefix="event"):
+    """Callback data for event preview buttons."""
+
+    action: str
+    event_id: str
+
+
+class NoteCallback(CallbackData, prefix="note"):
+    """Callback data for note preview buttons."""
+
+    action: str
+    note_id: str
 
 
 async def call_api(endpoint: str, method: str = "POST", **kwargs) -> Optional[dict]:
     """Make API call to backend."""
-    url = f"{config.API_URL}{endpoint}"
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            if method == "POST":
-                response = await client.post(url, **kwargs)
-            else:
-                response = await client.get(url, **kwargs)
-
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"API error: {response.status_code} - {response.text}")
-                return None
+        response = await get_http_client().request(method, endpoint, **kwargs)
+
+        if response.status_code == 200:
+            return orjson.loads(response.content)
+        else:
+            logger.error(f"API error: {response.status_code} - {response.text}")
+            return None
     except Exception as e:
         logger.error(f"API call failed: {e}")
         return None
 
 
+EVENT_PREVIEW_TEMPLATE = (
+    "📅 <b>{title}</b>\n"
+    "🕐 {start}\n"
+    "📍 {location}\n"
+    "📅 Календарь: <i>Основной</i>"
+)
+
+
 def format_event_preview(parsed: dict) -> str:
     """Format parsed event for user preview."""
     title = parsed.get("title", "Событие")
@@ -47,18 +93,12 @@ def format_event_preview(parsed: dict) -> str:
     # Format datetime if present
     if start and start != "Не указано":
         try:
-            from datetime import datetime
-            dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
+            dt = datetime.fromisoformat(start)
             start = dt.strftime("%d.%m.%Y %H:%M")
-        except:
+        except ValueError:
             pass
 
-    return (
-        f"📅 <b>{title}</b>\n"
-        f"🕐 {start}\n"
-        f"📍 {location}\n"
-        f"📅 Календарь: <i>Основной</i>"
-    )
+    return EVENT_PREVIEW_TEMPLATE.format(title=title, start=start, location=location)
 
 
 def get_event_keyboard(event_id: str) -> InlineKeyboardMarkup:
@@ -66,27 +106,50 @@ def get_event_keyboard(event_id: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
-                InlineKeyboardButton(text="✓ Создать", callback_data=f"confirm:{event_id}"),
-                InlineKeyboardButton(text="✎ Изменить", callback_data=f"edit:{event_id}"),
+                InlineKeyboardButton(
+                    text="✓ Создать",
+                    callback_data=EventCallback(action="confirm", event_id=event_id).pack(),
+                ),
+                InlineKeyboardButton(
+                    text="✎ Изменить",
+                    callback_data=EventCallback(action="edit", event_id=event_id).pack(),
+                ),
             ],
             [
-                InlineKeyboardButton(text="📅 Другой календарь", callback_data=f"calendar:{event_id}"),
-                InlineKeyboardButton(text="✗ Отмена", callback_data=f"cancel:{event_id}"),
+                InlineKeyboardButton(
+                    text="📅 Другой календарь",
+                    callback_data=EventCallback(action="calendar", event_id=event_id).pack(),
+                ),
+                InlineKeyboardButton(
+                    text="✗ Отмена",
+                    callback_data=EventCallback(action="cancel", event_id=event_id).pack(),
+                ),
             ],
         ]
     )
 
 
+# Static keyboard parts are built once and shared; they are never mutated
+OPEN_NOTES_BUTTON = InlineKeyboardButton(text="📓 Открыть Notes", url="mobilenotes://")
+OPEN_NOTES_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[[OPEN_NOTES_BUTTON]])
+
+
 def get_note_keyboard(note_id: str) -> InlineKeyboardMarkup:
     """Create inline keyboard for note (Apple Notes clipboard bridge)."""
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
-                InlineKeyboardButton(text="📋 Скопировать", callback_data=f"copy_note:{note_id}"),
-                InlineKeyboardButton(text="📓 Открыть Notes", url="mobilenotes://"),
+                InlineKeyboardButton(
+                    text="📋 Скопировать",
+                    callback_data=NoteCallback(action="copy", note_id=note_id).pack(),
+                ),
+                OPEN_NOTES_BUTTON,
             ],
             [
-                InlineKeyboardButton(text="✗ Отмена", callback_data=f"cancel_note:{note_id}"),
+                InlineKeyboardButton(
+                    text="✗ Отмена",
+                    callback_data=NoteCallback(action="cancel", note_id=note_id).pack(),
+                ),
             ],
         ]
     )
@@ -100,17 +163,17 @@ async def handle_text(message: Message):
 
     logger.info(f"Text from {user_id}: {text[:50]}...")
 
-    # Show typing indicator
-    await message.bot.send_chat_action(message.chat.id, "typing")
-
-    # Parse message via API
-    result = await call_api(
-        "/telegram/parse",
-        json={
-            "message_type": "text",
-            "content": text,
-            "user_timezone": "Europe/Moscow",
-        },
+    # Show typing indicator while the API parses the message
+    _, result = await asyncio.gather(
+        message.bot.send_chat_action(message.chat.id, "typing"),
+        call_api(
+            "/telegram/parse",
+            json={
+                "message_type": "text",
+                "content": text,
+                "user_timezone": "Europe/Moscow",
+            },
+        ),
     )
 
     if not result:
@@ -122,7 +185,7 @@ async def handle_text(message: Message):
     if content_type == "event":
         # Generate event ID
         event_id = f"{user_id}_{message.message_id}"
-        pending_events[event_id] = result
+        await save_pending(event_id, result)
 
         preview = format_event_preview(result)
         keyboard = get_event_keyboard(event_id)
@@ -131,7 +194,7 @@ async def handle_text(message: Message):
 
     elif content_type == "note":
         note_id = f"{user_id}_{message.message_id}"
-        pending_events[note_id] = result
+        await save_pending(note_id, result)
 
         title = result.get("title", "Заметка")
         content = result.get("note_content", text)
@@ -160,29 +223,36 @@ async def handle_voice(message: Message):
     user_id = message.from_user.id
     logger.info(f"Voice from {user_id}")
 
-    await message.answer("🎤 Распознаю голосовое сообщение...")
-    await message.bot.send_chat_action(message.chat.id, "typing")
+    # Status reply, typing indicator and file lookup are independent requests
+    bot = message.bot
+    _, _, file = await asyncio.gather(
+        message.answer("🎤 Распознаю голосовое сообщение..."),
+        bot.send_chat_action(message.chat.id, "typing"),
+        bot.get_file(message.voice.file_id),
+    )
 
-    # Download voice file
-    file = await message.bot.get_file(message.voice.file_id)
-    file_bytes = await message.bot.download_file(file.file_path)
+    # Stream the voice file from Telegram straight into the upload, chunk by chunk
+    audio_stream = bot.session.stream_content(
+        url=bot.session.api.file_url(bot.token, file.file_path),
+        raise_for_status=True,
+    )
 
     # Transcribe via API
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            f"{config.API_URL}/telegram/transcribe",
-            content=file_bytes.read(),
-            headers={
-                "Content-Type": "audio/ogg",
-                "X-Filename": "voice.oga",
-            },
-        )
+    response = await get_http_client().post(
+        "/telegram/transcribe",
+        content=audio_stream,
+        headers={
+            "Content-Type": "audio/ogg",
+            "X-Filename": "voice.oga",
+        },
+        timeout=60.0,
+    )
 
     if response.status_code != 200:
         await message.answer("❌ Не удалось распознать голосовое сообщение.")
         return
 
-    transcribed_text = response.json().get("text", "")
+    transcribed_text = orjson.loads(response.content).get("text", "")
     logger.info(f"Transcribed: {transcribed_text[:50]}...")
 
     # Parse transcribed text
@@ -206,9 +276,9 @@ async def handle_voice(message: Message):
 
     if content_type == "event":
         event_id = f"{user_id}_{message.message_id}"
-        pending_events[event_id] = result
+        await save_pending(event_id, result)
 
-        preview = f"📝 <i>{transcribed_text}</i>\n\n" + format_event_preview(result)
+        preview = f"📝 <i>{transcribed_text}</i>\n\n{format_event_preview(result)}"
         keyboard = get_event_keyboard(event_id)
 
         await message.answer(preview, reply_markup=keyboard)
@@ -235,17 +305,18 @@ async def handle_forwarded(message: Message):
 
     logger.info(f"Forwarded from {forwarded_from}: {text[:50]}...")
 
-    await message.bot.send_chat_action(message.chat.id, "typing")
-
-    # Parse with forwarded context
-    result = await call_api(
-        "/telegram/parse",
-        json={
-            "message_type": "forwarded",
-            "content": text,
-            "forwarded_from": forwarded_from,
-            "user_timezone": "Europe/Moscow",
-        },
+    # Parse with forwarded context, showing the typing indicator meanwhile
+    _, result = await asyncio.gather(
+        message.bot.send_chat_action(message.chat.id, "typing"),
+        call_api(
+            "/telegram/parse",
+            json={
+                "message_type": "forwarded",
+                "content": text,
+                "forwarded_from": forwarded_from,
+                "user_timezone": "Europe/Moscow",
+            },
+        ),
     )
 
     if not result:
@@ -256,14 +327,12 @@ async def handle_forwarded(message: Message):
 
     if content_type == "event":
         event_id = f"{user_id}_{message.message_id}"
-        pending_events[event_id] = result
-
-        if forwarded_from:
-            result["participants"] = result.get("participants", []) + [forwarded_from]
 
         preview = format_event_preview(result)
         if forwarded_from:
-            preview += f"\n👤 Участник: {forwarded_from}"
+            result["participants"] = result.get("participants", []) + [forwarded_from]
+            preview = f"{preview}\n👤 Участник: {forwarded_from}"
+        await save_pending(event_id, result)
 
         keyboard = get_event_keyboard(event_id)
         await message.answer(preview, reply_markup=keyboard)
@@ -274,11 +343,11 @@ async def handle_forwarded(message: Message):
         )
 
 
-@router.callback_query(lambda c: c.data.startswith("confirm:"))
-async def confirm_event(callback: CallbackQuery):
+@router.callback_query(EventCallback.filter(F.action == "confirm"))
+async def confirm_event(callback: CallbackQuery, callback_data: EventCallback):
     """Handle event confirmation."""
-    event_id = callback.data.split(":")[1]
-    event_data = pending_events.get(event_id)
+    event_id = callback_data.event_id
+    event_data = await pop_pending(event_id)
 
     if not event_data:
         await callback.answer("Событие устарело", show_alert=True)
@@ -289,17 +358,14 @@ async def confirm_event(callback: CallbackQuery):
         callback.message.text + "\n\n✅ <b>Событие создано!</b>",
         reply_markup=None,
     )
-
-    # Clean up
-    pending_events.pop(event_id, None)
     await callback.answer("Событие создано!")
 
 
-@router.callback_query(lambda c: c.data.startswith("cancel:"))
-async def cancel_event(callback: CallbackQuery):
+@router.callback_query(EventCallback.filter(F.action == "cancel"))
+async def cancel_event(callback: CallbackQuery, callback_data: EventCallback):
     """Handle event cancellation."""
-    event_id = callback.data.split(":")[1]
-    pending_events.pop(event_id, None)
+    event_id = callback_data.event_id
+    await delete_pending(event_id)
 
     await callback.message.edit_text(
         callback.message.text + "\n\n❌ <i>Отменено</i>",
@@ -308,11 +374,11 @@ async def cancel_event(callback: CallbackQuery):
     await callback.answer("Отменено")
 
 
-@router.callback_query(lambda c: c.data.startswith("copy_note:"))
-async def copy_note(callback: CallbackQuery):
+@router.callback_query(NoteCallback.filter(F.action == "copy"))
+async def copy_note(callback: CallbackQuery, callback_data: NoteCallback):
     """Handle note copy (clipboard bridge for Apple Notes)."""
-    note_id = callback.data.split(":")[1]
-    note_data = pending_events.get(note_id)
+    note_id = callback_data.note_id
+    note_data = await pop_pending(note_id)
 
     if not note_data:
         await callback.answer("Заметка устарела", show_alert=True)
@@ -327,12 +393,6 @@ async def copy_note(callback: CallbackQuery):
     await callback.message.edit_text(
         f"📋 <b>Скопируйте текст ниже и вставьте в Apple Notes:</b>\n\n"
         f"<code>{clipboard_text}</code>",
-        reply_markup=InlineKeyboardMarkup(
-            inline_keyboard=[
-                [InlineKeyboardButton(text="📓 Открыть Notes", url="mobilenotes://")]
-            ]
-        ),
+        reply_markup=OPEN_NOTES_KEYBOARD,
     )
-
-    pending_events.pop(note_id, None)
     await callback.answer("Текст готов для копирования!")
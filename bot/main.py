@@ -11,8 +11,6 @@ from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 
-from bot.handlers import messages, start
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,6 +28,10 @@ async def main():
         logger.error("TELEGRAM_BOT_TOKEN not set")
         sys.exit(1)
 
+    # Handlers pull in httpx, Redis and orjson; import them only once configured
+    from bot.handlers import messages, start
+    from bot.storage import close_redis
+
     # Initialize bot and dispatcher
     bot = Bot(
         token=token,
@@ -47,7 +49,17 @@ async def main():
     try:
         await dp.start_polling(bot)
     finally:
-        await bot.session.close()
+        # Connections are independent, so close them concurrently; one
+        # failing close must not cancel the others
+        results = await asyncio.gather(
+            messages.close_http_client(),
+            close_redis(),
+            bot.session.close(),
+            return_exceptions=True,
+        )
+        for name, result in zip(("HTTP client", "Redis", "bot session"), results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to close {name}: {result}")
 
 
 if __name__ == "__main__":
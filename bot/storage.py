@@ -0,0 +1,56 @@
+"""
+Redis storage for parsed events and notes awaiting user confirmation.
+"""
+
+from typing import Optional
+
+import orjson
+import redis.asyncio as redis
+
+from bot.config import config
+
+# Shared connection pool: concurrent callbacks wait for a free connection
+# instead of opening unbounded sockets, and idle sockets are health-checked
+REDIS_MAX_CONNECTIONS = 64
+REDIS_POOL_TIMEOUT = 20  # seconds to wait for a free connection
+REDIS_HEALTH_CHECK_INTERVAL = 30  # seconds
+
+# Create Redis client (connects lazily on first command; owns the pool)
+redis_client: redis.Redis = redis.Redis.from_pool(
+    redis.BlockingConnectionPool.from_url(
+        config.REDIS_URL,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        socket_keepalive=True,
+    )
+)
+
+# Unanswered previews expire instead of piling up
+PENDING_TTL = 60 * 60 * 24  # 24 hours
+
+
+def _pending_key(item_id: str) -> str:
+    """Redis key for a pending event or note."""
+    return f"pending:{item_id}"
+
+
+async def save_pending(item_id: str, data: dict) -> None:
+    """Store a parsed event or note until the user confirms or cancels it."""
+    await redis_client.set(_pending_key(item_id), orjson.dumps(data), ex=PENDING_TTL)
+
+
+async def pop_pending(item_id: str) -> Optional[dict]:
+    """Atomically fetch and delete a pending event or note in one round trip."""
+    data = await redis_client.getdel(_pending_key(item_id))
+    return orjson.loads(data) if data is not None else None
+
+
+async def delete_pending(item_id: str) -> None:
+    """Forget a pending event or note."""
+    await redis_client.delete(_pending_key(item_id))
+
+
+async def close_redis() -> None:
+    """Close Redis connections and the pool."""
+    await redis_client.aclose()
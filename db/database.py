@@ -3,20 +3,37 @@ Database connection and session management.
 """
 
 from collections.abc import AsyncGenerator
+from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 from api.config import get_settings
 
 settings = get_settings()
 
+if settings.database_pgbouncer:
+    # PgBouncer owns the pool. It rejects unknown startup parameters, so JIT is
+    # turned off on the role instead (see .env.example). In transaction mode
+    # server connections are shared, so prepared statements are never cached
+    # and get unique names - asyncpg's __asyncpg_stmt_N__ would collide.
+    pool_kwargs: dict = {"poolclass": NullPool}
+    connect_args: dict = {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+else:
+    pool_kwargs = {"pool_pre_ping": True, "pool_size": 10, "max_overflow": 20}
+    # Short OLTP queries never benefit from JIT compilation, only pay for it
+    connect_args = {"server_settings": {"jit": "off"}}
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    connect_args=connect_args,
+    **pool_kwargs,
 )
 
 # Create async session factory
@@ -0,0 +1,44 @@
+"""Enforce a single primary calendar per integration
+
+Revision ID: 002_primary_calendar_index
+Revises: 001_initial
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002_primary_calendar_index'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the oldest primary calendar per integration
+    op.execute(
+        """
+        UPDATE calendars SET is_primary = false
+        WHERE is_primary AND id NOT IN (
+            SELECT DISTINCT ON (integration_id) id
+            FROM calendars
+            WHERE is_primary
+            ORDER BY integration_id, created_at
+        )
+        """
+    )
+
+    op.create_index(
+        'uq_primary_calendar_per_integration',
+        'calendars',
+        ['integration_id'],
+        unique=True,
+        postgresql_where=sa.text('is_primary'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_primary_calendar_per_integration', table_name='calendars')
@@ -0,0 +1,30 @@
+"""Add partial index for active integrations lookup
+
+Revision ID: 003_integrations_active_index
+Revises: 002_primary_calendar_index
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003_integrations_active_index'
+down_revision: Union[str, None] = '002_primary_calendar_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_integrations_user_active',
+        'integrations',
+        ['user_id'],
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_integrations_user_active', table_name='integrations')
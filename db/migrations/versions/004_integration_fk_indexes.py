@@ -0,0 +1,28 @@
+"""Index integration foreign keys on calendars and notion_databases
+
+Revision ID: 004_integration_fk_indexes
+Revises: 003_integrations_active_index
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '004_integration_fk_indexes'
+down_revision: Union[str, None] = '003_integrations_active_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_calendars_integration_id', 'calendars', ['integration_id'])
+    op.create_index(
+        'ix_notion_databases_integration_id', 'notion_databases', ['integration_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notion_databases_integration_id', table_name='notion_databases')
+    op.drop_index('ix_calendars_integration_id', table_name='calendars')
@@ -0,0 +1,36 @@
+"""Add index for per-user event log lookups
+
+Revision ID: 006_events_log_user_created
+Revises: 005_timestamptz_updated_at
+Create Date: 2026-10-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '006_events_log_user_created'
+down_revision: Union[str, None] = '005_timestamptz_updated_at'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # events_log is append-only and can be large; don't block writes while building
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_log_user_created',
+            'events_log',
+            ['user_id', 'created_at'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_events_log_user_created',
+            table_name='events_log',
+            postgresql_concurrently=True,
+        )
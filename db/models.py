@@ -7,13 +7,19 @@ from typing import Optional
 from uuid import uuid4
 
 from sqlalchemy import (
+    DDL,
     BigInteger,
     Boolean,
     DateTime,
+    FetchedValue,
     ForeignKey,
+    Index,
     String,
     Text,
     UniqueConstraint,
+    event,
+    func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -28,6 +34,8 @@ class User(Base):
     """User model - stores Telegram users."""
 
     __tablename__ = "users"
+    # Fetch server-generated timestamps with RETURNING instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4
@@ -38,20 +46,34 @@ class User(Base):
     telegram_username: Mapped[Optional[str]] = mapped_column(String(255))
     email: Mapped[Optional[str]] = mapped_column(String(255))
     timezone: Mapped[str] = mapped_column(String(50), default="Europe/Moscow")
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    # Set by the set_updated_at trigger on every UPDATE
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True),
+        server_default=func.now(),
+        server_onupdate=FetchedValue(),
     )
 
     # Relationships
     integrations: Mapped[list["Integration"]] = relationship(
-        back_populates="user", cascade="all, delete-orphan"
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     org_memberships: Mapped[list["OrgMembership"]] = relationship(
-        back_populates="user", cascade="all, delete-orphan"
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     events_log: Mapped[list["EventLog"]] = relationship(
-        back_populates="user", cascade="all, delete-orphan"
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
 
@@ -65,11 +87,16 @@ class Organization(Base):
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     plan: Mapped[str] = mapped_column(String(50), default="free")
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
 
     # Relationships
     memberships: Mapped[list["OrgMembership"]] = relationship(
-        back_populates="organization", cascade="all, delete-orphan"
+        back_populates="organization",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
 
@@ -85,17 +112,25 @@ class OrgMembership(Base):
         UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True
     )
     role: Mapped[str] = mapped_column(String(50), default="member")
-    joined_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    joined_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
 
     # Relationships
-    user: Mapped["User"] = relationship(back_populates="org_memberships")
-    organization: Mapped["Organization"] = relationship(back_populates="memberships")
+    user: Mapped["User"] = relationship(
+        back_populates="org_memberships", lazy="raise_on_sql"
+    )
+    organization: Mapped["Organization"] = relationship(
+        back_populates="memberships", lazy="raise_on_sql"
+    )
 
 
 class Integration(Base):
     """Integration model - stores OAuth tokens and settings for external services."""
 
     __tablename__ = "integrations"
+    # Fetch server-generated timestamps with RETURNING instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4
@@ -111,22 +146,42 @@ class Integration(Base):
     )  # Encrypted tokens
     settings: Mapped[dict] = mapped_column(JSONB, default=dict)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    # Set by the set_updated_at trigger on every UPDATE
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True),
+        server_default=func.now(),
+        server_onupdate=FetchedValue(),
     )
 
     __table_args__ = (
         UniqueConstraint("user_id", "provider", name="uq_user_provider"),
+        # (user_id, provider) lookups already hit uq_user_provider; this one
+        # serves "active integrations of a user" without scanning inactive rows
+        Index(
+            "ix_integrations_user_active",
+            "user_id",
+            postgresql_where=text("is_active"),
+        ),
     )
 
     # Relationships
-    user: Mapped["User"] = relationship(back_populates="integrations")
+    user: Mapped["User"] = relationship(
+        back_populates="integrations", lazy="raise_on_sql"
+    )
     calendars: Mapped[list["Calendar"]] = relationship(
-        back_populates="integration", cascade="all, delete-orphan"
+        back_populates="integration",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     notion_databases: Mapped[list["NotionDatabase"]] = relationship(
-        back_populates="integration", cascade="all, delete-orphan"
+        back_populates="integration",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
 
@@ -139,7 +194,10 @@ class Calendar(Base):
         UUID(as_uuid=True), primary_key=True, default=uuid4
     )
     integration_id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("integrations.id", ondelete="CASCADE"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("integrations.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     external_id: Mapped[str] = mapped_column(
         String(255), nullable=False
@@ -148,11 +206,26 @@ class Calendar(Base):
     color: Mapped[Optional[str]] = mapped_column(String(20))
     is_primary: Mapped[bool] = mapped_column(Boolean, default=False)
     is_enabled: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index(
+            "uq_primary_calendar_per_integration",
+            "integration_id",
+            unique=True,
+            postgresql_where=text("is_primary"),
+        ),
+    )
 
     # Relationships
-    integration: Mapped["Integration"] = relationship(back_populates="calendars")
-    events_log: Mapped[list["EventLog"]] = relationship(back_populates="calendar")
+    integration: Mapped["Integration"] = relationship(
+        back_populates="calendars", lazy="raise_on_sql"
+    )
+    events_log: Mapped[list["EventLog"]] = relationship(
+        back_populates="calendar", passive_deletes=True, lazy="raise_on_sql"
+    )
 
 
 class EventLog(Base):
@@ -173,11 +246,21 @@ class EventLog(Base):
     original_message: Mapped[Optional[str]] = mapped_column(Text)
     parsed_data: Mapped[Optional[dict]] = mapped_column(JSONB)
     status: Mapped[str] = mapped_column(String(50))  # created, failed, cancelled
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index("ix_events_log_user_created", "user_id", "created_at"),
+    )
 
     # Relationships
-    user: Mapped["User"] = relationship(back_populates="events_log")
-    calendar: Mapped[Optional["Calendar"]] = relationship(back_populates="events_log")
+    user: Mapped["User"] = relationship(
+        back_populates="events_log", lazy="raise_on_sql"
+    )
+    calendar: Mapped[Optional["Calendar"]] = relationship(
+        back_populates="events_log", lazy="raise_on_sql"
+    )
 
 
 class NotionDatabase(Base):
@@ -189,12 +272,41 @@ class NotionDatabase(Base):
         UUID(as_uuid=True), primary_key=True, default=uuid4
     )
     integration_id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("integrations.id", ondelete="CASCADE"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("integrations.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     external_id: Mapped[str] = mapped_column(String(255), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     is_default: Mapped[bool] = mapped_column(Boolean, default=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
 
     # Relationships
-    integration: Mapped["Integration"] = relationship(back_populates="notion_databases")
+    integration: Mapped["Integration"] = relationship(
+        back_populates="notion_databases", lazy="raise_on_sql"
+    )
+
+
+# Tables created by metadata.create_all (init_db) get the same updated_at
+# trigger that migration 005 installs
+_CREATE_SET_UPDATED_AT = DDL(
+    """
+    CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+    BEGIN
+        NEW.updated_at = now();
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """
+).execute_if(dialect="postgresql")
+_CREATE_UPDATED_AT_TRIGGER = DDL(
+    "CREATE TRIGGER trg_%(table)s_updated_at BEFORE UPDATE ON %(table)s "
+    "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+).execute_if(dialect="postgresql")
+
+for _table in (User.__table__, Integration.__table__):
+    event.listen(_table, "after_create", _CREATE_SET_UPDATED_AT)
+    event.listen(_table, "after_create", _CREATE_UPDATED_AT_TRIGGER)
@@ -0,0 +1,85 @@
+"""
+Tests for signed OAuth state tokens.
+"""
+
+import time
+from typing import Any
+
+import pytest
+
+from api.utils import oauth_state
+from api.utils.oauth_state import OAUTH_STATE_TTL, consume_oauth_state, create_oauth_state
+
+
+class FakeRedis:
+    """In-memory stand-in for the SET NX used to mark states as consumed."""
+
+    def __init__(self) -> None:
+        self.keys: dict[str, Any] = {}
+
+    async def set(self, key: str, value: Any, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.keys:
+            return False
+        self.keys[key] = value
+        return True
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    fake = FakeRedis()
+    monkeypatch.setattr(oauth_state, "redis_client", fake)
+    return fake
+
+
+async def test_round_trip_returns_provider() -> None:
+    state = create_oauth_state("google")
+
+    assert await consume_oauth_state(state) == "google"
+
+
+async def test_states_are_unique_within_a_second() -> None:
+    first = create_oauth_state("google")
+    second = create_oauth_state("google")
+
+    assert first != second
+    assert await consume_oauth_state(first) == "google"
+    assert await consume_oauth_state(second) == "google"
+
+
+async def test_tampered_tag_is_rejected() -> None:
+    payload, _, tag = create_oauth_state("google").rpartition(".")
+    forged = tag[:-1] + ("A" if tag[-1] != "A" else "B")
+
+    assert await consume_oauth_state(f"{payload}.{forged}") is None
+
+
+async def test_tampered_payload_is_rejected() -> None:
+    state = create_oauth_state("google")
+
+    assert await consume_oauth_state(state.replace("google", "outlook", 1)) is None
+
+
+async def test_expired_state_is_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    state = create_oauth_state("google")
+    later = time.time() + OAUTH_STATE_TTL + 1
+    monkeypatch.setattr(oauth_state.time, "time", lambda: later)
+
+    assert await consume_oauth_state(state) is None
+
+
+async def test_non_ascii_state_is_rejected() -> None:
+    state = create_oauth_state("google")
+
+    assert await consume_oauth_state(state[:-1] + "é") is None
+
+
+@pytest.mark.parametrize("state", ["", "google", "google.123", "google.abc.nonce.tag"])
+async def test_malformed_state_is_rejected(state: str) -> None:
+    assert await consume_oauth_state(state) is None
+
+
+async def test_second_use_is_rejected() -> None:
+    state = create_oauth_state("google")
+
+    assert await consume_oauth_state(state) == "google"
+    assert await consume_oauth_state(state) is None